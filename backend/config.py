@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,7 +7,26 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# "supabase" (default) or "sqlite" for a local database, e.g. for load testing.
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase").lower()
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "internships.db"))
+
 SCRAPE_INTERVAL_HOURS = 2
+SCRAPER_TIMEOUT_SECONDS = 1800
+SCRAPER_KILL_GRACE_SECONDS = 10
+SCRAPE_JOB_HISTORY_SIZE = 50
+
+# Set to "false" on API workers when the standalone worker (worker.py) runs the scheduler.
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+# Only the process holding this lock runs the periodic scheduler; the others stay on standby.
+SCHEDULER_LOCK_FILE = os.getenv("SCHEDULER_LOCK_FILE", os.path.join(tempfile.gettempdir(), "internship_scheduler.lock"))
+SCHEDULER_LEADER_RETRY_SECONDS = 60
+# Held for the duration of a crawl so manual and scheduled jobs never overlap across processes.
+SCRAPE_LOCK_FILE = os.getenv("SCRAPE_LOCK_FILE", os.path.join(tempfile.gettempdir(), "internship_scrape.lock"))
+# Scrape job records, shared by the API workers and the scheduler process.
+SCRAPE_JOBS_DIR = os.getenv("SCRAPE_JOBS_DIR", os.path.join(tempfile.gettempdir(), "internship_scrape_jobs"))
+# How often the active scheduler picks up jobs queued by POST /scrape/trigger.
+SCRAPE_QUEUE_POLL_SECONDS = 2
 
 SCRAPE_KEYWORDS = [
     "software",
@@ -24,6 +44,53 @@ SCRAPE_LOCATIONS = [
     "France"
 ]
 
+# Optional detail page enrichment of new listings (full descriptions)
+ENRICHMENT_ENABLED = os.getenv("ENRICHMENT_ENABLED", "false").lower() in ("1", "true", "yes")
+ENRICHMENT_CONCURRENCY = 4
+ENRICHMENT_DOMAIN_DELAY_SECONDS = 2
+ENRICHMENT_MAX_PAGES_PER_RUN = 200
+ENRICHMENT_TIMEOUT_SECONDS = 15
+ENRICHMENT_CACHE_DIR = os.getenv("ENRICHMENT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "internship_detail_cache"))
+ENRICHMENT_CACHE_TTL_HOURS = 72
+
+# Retention: listings older than RETENTION_MAX_AGE_DAYS (by date_posted) or
+# missed by the last RETENTION_UNSEEN_CYCLES successful scrapes of their source
+# (failed and empty runs do not count) are moved to
+# internships_archive. Set either one to 0 to disable that policy. Off by
+# default: it deletes from the internships table, so the retention section of
+# utils/table.sql must be applied first.
+RETENTION_ENABLED = os.getenv("RETENTION_ENABLED", "false").lower() in ("1", "true", "yes")
+RETENTION_MAX_AGE_DAYS = int(os.getenv("RETENTION_MAX_AGE_DAYS", "60"))
+RETENTION_UNSEEN_CYCLES = int(os.getenv("RETENTION_UNSEEN_CYCLES", "36"))
+RETENTION_BATCH_SIZE = 1000
+RETENTION_MAX_BATCHES_PER_RUN = 50
+
+# Live feed of new internships (GET /internships/stream)
+FEED_MARKER_FILE = os.getenv("FEED_MARKER_FILE", os.path.join(tempfile.gettempdir(), "internship_feed.marker"))
+FEED_MARKER_CHECK_SECONDS = 1
+FEED_POLL_SECONDS = 30
+FEED_MAX_EVENTS_PER_UPDATE = 200
+FEED_CLIENT_BUFFER_SIZE = 500
+FEED_KEEPALIVE_SECONDS = 15
+
+# Facet counts returned by GET /internships/search?facets=true
+FACET_TOP_N = 20
+FACET_CACHE_TTL_SECONDS = 60
+FACET_CACHE_MAX_ENTRIES = 1000
+
+# Autocomplete index behind GET /internships/suggest
+SUGGEST_MAX_TERMS = 50000
+SUGGEST_REFRESH_SECONDS = 60
+SUGGEST_REBUILD_SECONDS = 6 * 3600
+
+# Opt-in profiling of API requests (X-Profile: 1 header or random sampling)
+# and scraper runs (--profile / SCRAPER_PROFILE=true). Output goes to PROFILE_DIR.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+SCRAPER_PROFILE = os.getenv("SCRAPER_PROFILE", "false").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles"))
+PROFILE_SAMPLE_INTERVAL_MS = 5
+
 # INDEED_BASE_URL = "https://ma.indeed.com"
 # INDEED_MAX_PAGES = 2
 # INDEED_DAYS_AGO = 14
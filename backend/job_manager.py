@@ -0,0 +1,333 @@
+import sys
+import os
+import re
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from config import SCRAPE_KEYWORDS, SCRAPE_LOCATIONS, SCRAPER_TIMEOUT_SECONDS, SCRAPER_KILL_GRACE_SECONDS, SCRAPE_JOB_HISTORY_SIZE, SCRAPE_LOCK_FILE, SCRAPE_JOBS_DIR
+from utils.file_lock import FileLock
+from utils.job_store import JobStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+INSERTED_PATTERN = re.compile(r"Inserted (\d+) new internships")
+
+
+class ScrapeJob:
+    """A single scraping cycle over one or more sources, tracked by id."""
+
+    def __init__(self, sources: List[str], trigger: str, profile: bool = False):
+        self.id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.profile = profile
+        self.status = 'pending'
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.sources: Dict[str, Dict] = OrderedDict(
+            (name, {
+                'status': 'pending',
+                'started_at': None,
+                'finished_at': None,
+                'returncode': None,
+                'inserted': None,
+                'error': None,
+            })
+            for name in sources
+        )
+        self.cancel_event = threading.Event()
+        self.process: Optional[subprocess.Popen] = None
+        self.thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_record(cls, record: Dict, sources: List[str]) -> "ScrapeJob":
+        job = cls(sources, record['trigger'], record.get('profile', False))
+        job.id = record['job_id']
+        job.created_at = datetime.fromisoformat(record['created_at'])
+        return job
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ('pending', 'running')
+
+    def to_dict(self) -> Dict:
+        def iso(value):
+            return value.isoformat() if value else None
+
+        return {
+            'job_id': self.id,
+            'trigger': self.trigger,
+            'profile': self.profile,
+            'status': self.status,
+            'created_at': iso(self.created_at),
+            'started_at': iso(self.started_at),
+            'finished_at': iso(self.finished_at),
+            'error': self.error,
+            'owner_pid': os.getpid(),
+            'sources': {
+                name: {**progress, 'started_at': iso(progress['started_at']), 'finished_at': iso(progress['finished_at'])}
+                for name, progress in self.sources.items()
+            },
+        }
+
+
+class ScrapeJobManager:
+    """
+    Queues and runs scrape jobs, one at a time across every process on the
+    host. Job records live in a JobStore shared by the API workers and the
+    scheduler process: any process can submit, inspect or cancel a job, but
+    only the active scheduler (see ScraperScheduler) calls run_pending() to
+    actually crawl. Submission checks the store under its lock, so concurrent
+    triggers collapse onto the job already queued or in flight. The crawl
+    file lock is held for the whole run, which lets other processes detect a
+    job whose owner died.
+    """
+
+    def __init__(self, scraper_names: List[str]):
+        self.scraper_names = scraper_names
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ScrapeJob] = {}
+        self._current: Optional[ScrapeJob] = None
+        self._crawl_lock = FileLock(SCRAPE_LOCK_FILE)
+        self.store = JobStore(SCRAPE_JOBS_DIR, SCRAPE_JOB_HISTORY_SIZE)
+
+    @property
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._current is not None and self._current.is_active
+
+    def submit(self, trigger: str = 'manual', profile: bool = False) -> Tuple[Dict, bool]:
+        """Queues a new job, or returns the one already queued or running; the flag tells which."""
+        with self.store.lock():
+            active = self._find_active()
+            if active is not None:
+                return active, False
+
+            job = ScrapeJob(self.scraper_names, trigger, profile)
+            self._persist(job)
+            self.store.prune()
+            return job.to_dict(), True
+
+    def run_pending(self):
+        """Starts the oldest queued job in this process, unless a crawl is already under way."""
+        with self._lock:
+            # The crawl lock stays held until _run_job has fully wound down,
+            # even after the job's status turned terminal.
+            if self._crawl_lock.is_held:
+                return
+            with self.store.lock():
+                record = self._find_active()
+                if record is None or record['status'] != 'pending':
+                    return
+                if not self._crawl_lock.acquire():
+                    return
+
+                job = ScrapeJob.from_record(record, self.scraper_names)
+                job.status = 'running'
+                job.started_at = datetime.utcnow()
+                self._persist(job)
+
+            self._jobs = {job_id: local for job_id, local in self._jobs.items() if local.is_active}
+            self._jobs[job.id] = job
+            self._current = job
+            job.thread = threading.Thread(target=self._run_job, args=(job,), daemon=True)
+            job.thread.start()
+
+    def _find_active(self) -> Optional[Dict]:
+        """Returns the oldest queued or running job, failing runs whose owner process died. Needs the store lock."""
+        while True:
+            active = self.store.find_active()
+            if active is None or active['status'] != 'running' or self._crawl_lock.is_held:
+                return active
+
+            probe = FileLock(SCRAPE_LOCK_FILE)
+            if not probe.acquire():
+                return active
+            probe.release()
+            active['status'] = 'failed'
+            active['error'] = 'The process running this job exited.'
+            active['finished_at'] = datetime.utcnow().isoformat()
+            self.store.save(active)
+
+    def _persist(self, job: ScrapeJob):
+        try:
+            self.store.save(job.to_dict())
+        except OSError as e:
+            print(f"❌ Impossible d'enregistrer l'état du job {job.id}: {e}")
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.load(job_id)
+
+    def list(self) -> List[Dict]:
+        return self.store.list()[:SCRAPE_JOB_HISTORY_SIZE]
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """
+        Cancels a job. Queued jobs are cancelled directly; a job running in
+        another process is flagged in the store and stopped by its owner.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or not job.is_active:
+            return self._cancel_record(job_id)
+
+        job.cancel_event.set()
+        with self._lock:
+            process = job.process
+        if process is not None and process.poll() is None:
+            print(f"🛑 Arrêt du sous-processus en cours (pid {process.pid}) pour le job {job.id}.")
+            process.terminate()
+            threading.Timer(SCRAPER_KILL_GRACE_SECONDS, self._kill_if_alive, args=(process,)).start()
+        return job.to_dict()
+
+    def _cancel_record(self, job_id: str) -> Optional[Dict]:
+        with self.store.lock():
+            record = self.store.load(job_id)
+            if record is None or record['status'] not in ('pending', 'running'):
+                return record
+
+            if record['status'] == 'pending':
+                record['status'] = 'cancelled'
+                record['finished_at'] = datetime.utcnow().isoformat()
+                for progress in record['sources'].values():
+                    progress['status'] = 'cancelled'
+                self.store.save(record)
+            else:
+                self.store.request_cancel(job_id)
+                record['cancel_requested'] = True
+            return record
+
+    def _check_cancel_request(self, job: ScrapeJob) -> bool:
+        if not job.cancel_event.is_set() and self.store.is_cancel_requested(job.id):
+            self.cancel(job.id)
+        return job.cancel_event.is_set()
+
+    @staticmethod
+    def _kill_if_alive(process: subprocess.Popen):
+        if process.poll() is None:
+            process.kill()
+
+    def cancel_all(self):
+        with self._lock:
+            local_jobs = list(self._jobs.values())
+        for job in local_jobs:
+            if job.is_active:
+                self.cancel(job.id)
+
+    def _run_job(self, job: ScrapeJob):
+        print(f"\n{'='*60}")
+        print(f"🚀 Démarrage du scraping de tous les sites à {job.started_at.strftime('%Y-%m-%d %H:%M:%S')} UTC (job {job.id})")
+        print(f"Mots-clés: {SCRAPE_KEYWORDS}")
+        print(f"Lieux: {SCRAPE_LOCATIONS}")
+        print(f"{'='*60}\n")
+
+        try:
+            for scraper_name in job.sources:
+                if self._check_cancel_request(job):
+                    print("🛑 Scraping interrompu.")
+                    break
+                self._run_scraper_in_subprocess(job, scraper_name)
+
+            if job.cancel_event.is_set():
+                job.status = 'cancelled'
+                for progress in job.sources.values():
+                    if progress['status'] == 'pending':
+                        progress['status'] = 'cancelled'
+            elif any(p['status'] == 'failed' for p in job.sources.values()):
+                job.status = 'failed'
+            else:
+                job.status = 'completed'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            print(f"❌ Erreur inattendue dans le job {job.id}: {e}")
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._persist(job)
+            with self._lock:
+                self._crawl_lock.release()
+                if self._current is job:
+                    self._current = None
+            duration = (job.finished_at - job.started_at).total_seconds()
+            print(f"\n{'='*60}")
+            print(f"🏁 Scraping terminé en {duration:.2f} secondes (statut: {job.status}).")
+            print(f"{'='*60}\n")
+
+    def _run_scraper_in_subprocess(self, job: ScrapeJob, scraper_name: str):
+        progress = job.sources[scraper_name]
+        script_path = os.path.join(BASE_DIR, 'scrapers', f'run_{scraper_name.lower()}.py')
+
+        if not os.path.exists(script_path):
+            print(f"❌ Erreur: Le script {script_path} n'a pas été trouvé.")
+            progress['status'] = 'failed'
+            progress['error'] = 'Script not found.'
+            return
+
+        print(f"--- Démarrage du scraper: {scraper_name} ---")
+        progress['status'] = 'running'
+        progress['started_at'] = datetime.utcnow()
+        self._persist(job)
+        try:
+            with self._lock:
+                if job.cancel_event.is_set():
+                    progress['status'] = 'cancelled'
+                    return
+                job.process = subprocess.Popen(
+                    [sys.executable, script_path] + (['--profile'] if job.profile else []),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    encoding='utf-8'
+                )
+            process = job.process
+
+            deadline = time.monotonic() + SCRAPER_TIMEOUT_SECONDS
+            while True:
+                try:
+                    stdout, stderr = process.communicate(timeout=1)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                if time.monotonic() > deadline:
+                    process.kill()
+                    process.communicate()
+                    print(f"❌ {scraper_name} a expiré (timeout de {SCRAPER_TIMEOUT_SECONDS // 60} minutes).")
+                    progress['status'] = 'failed'
+                    progress['error'] = 'Timeout expired.'
+                    return
+                self._check_cancel_request(job)
+
+            progress['returncode'] = process.returncode
+            match = INSERTED_PATTERN.search(stdout or '')
+            if match:
+                progress['inserted'] = int(match.group(1))
+
+            if job.cancel_event.is_set():
+                print(f"🛑 {scraper_name} annulé.")
+                progress['status'] = 'cancelled'
+            elif process.returncode != 0:
+                print(f"❌ {scraper_name} a échoué avec le code {process.returncode}:")
+                print(stderr)
+                progress['status'] = 'failed'
+                error_lines = (stderr or '').strip().splitlines()
+                progress['error'] = error_lines[-1] if error_lines else f"Exit code {process.returncode}"
+            else:
+                print(f"--- Sortie de {scraper_name}: ---")
+                print(stdout)
+                print(f"--- {scraper_name} terminé ---")
+                progress['status'] = 'completed'
+
+        except Exception as e:
+            print(f"❌ Erreur inconnue lors de l'exécution de {scraper_name}: {e}")
+            progress['status'] = 'failed'
+            progress['error'] = str(e)
+        finally:
+            progress['finished_at'] = datetime.utcnow()
+            with self._lock:
+                job.process = None
+            self._persist(job)
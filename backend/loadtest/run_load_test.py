@@ -0,0 +1,311 @@
+"""
+HTTP load generator for the API. Replays a weighted mix of list, paging,
+search and stats requests at a fixed concurrency and reports throughput,
+latency percentiles and error rates. Results are saved as JSON so runs can
+be compared between versions.
+
+Against a running instance:
+
+    python loadtest/run_load_test.py --url http://127.0.0.1:8000 --concurrency 32 --duration 30
+
+Fully local (seeds SQLite and starts one uvicorn worker with DATA_BACKEND=sqlite):
+
+    python loadtest/seed_sqlite.py --count 20000
+    python loadtest/run_load_test.py --spawn-server --label baseline
+    python loadtest/run_load_test.py --spawn-server --label candidate --compare loadtest/results/<baseline>.json
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import http.client
+import json
+import math
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SEARCH_KEYWORDS = ['software', 'data', 'machine learning', 'web', 'pfe', 'stage', 'developer', 'analyst', 'casablanca', 'remote']
+SOURCES = ['LinkedIn', 'Rekrute', 'RemoteOK']
+
+DEFAULT_MIX = {
+    'list': 30,
+    'page': 20,
+    'search': 30,
+    'search_source': 10,
+    'stats': 7,
+    'last_update': 3,
+}
+
+def build_request(scenario: str, rng: random.Random) -> str:
+    if scenario == 'list':
+        return '/internships?' + urlencode({'limit': 50})
+    if scenario == 'page':
+        return '/internships?' + urlencode({'limit': 50, 'offset': 50 * rng.randint(1, 20)})
+    if scenario == 'search':
+        return '/internships/search?' + urlencode({'keyword': rng.choice(SEARCH_KEYWORDS), 'limit': 50})
+    if scenario == 'search_source':
+        return '/internships/search?' + urlencode({'keyword': rng.choice(SEARCH_KEYWORDS), 'source_site': rng.choice(SOURCES), 'limit': 50})
+    if scenario == 'stats':
+        return '/internships/stats'
+    if scenario == 'last_update':
+        return '/stats/last_update'
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown scenario '{name}'. Choose from: {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples: List[Tuple[str, float, bool]], elapsed: float) -> Dict:
+    latencies = sorted(latency for _, latency, _ in samples)
+    errors = sum(1 for _, _, ok in samples if not ok)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': errors / len(samples) if samples else 0.0,
+        'throughput_rps': len(samples) / elapsed if elapsed else 0.0,
+        'latency_ms': {
+            'mean': sum(latencies) / len(latencies) if latencies else None,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None,
+        },
+    }
+
+class LoadWorker(threading.Thread):
+    """Issues requests over one keep-alive connection until the deadline."""
+
+    def __init__(self, host: str, port: int, scenarios: List[str], weights: List[int], deadline: float,
+                 max_requests: Optional[int], counter: Dict, counter_lock: threading.Lock, seed: int, timeout: float):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.scenarios = scenarios
+        self.weights = weights
+        self.deadline = deadline
+        self.max_requests = max_requests
+        self.counter = counter
+        self.counter_lock = counter_lock
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.samples: List[Tuple[str, float, bool]] = []
+        self.error_messages: Dict[str, int] = {}
+
+    def _claim_request(self) -> bool:
+        if time.perf_counter() >= self.deadline:
+            return False
+        if self.max_requests is None:
+            return True
+        with self.counter_lock:
+            if self.counter['issued'] >= self.max_requests:
+                return False
+            self.counter['issued'] += 1
+            return True
+
+    def run(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        while self._claim_request():
+            scenario = self.rng.choices(self.scenarios, weights=self.weights)[0]
+            path = build_request(scenario, self.rng)
+            start = time.perf_counter()
+            ok = False
+            try:
+                conn.request('GET', path, headers={'Connection': 'keep-alive'})
+                response = conn.getresponse()
+                response.read()
+                ok = 200 <= response.status < 300
+                if not ok:
+                    self._record_error(f"HTTP {response.status}")
+            except Exception as e:
+                self._record_error(type(e).__name__)
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.samples.append((scenario, (time.perf_counter() - start) * 1000.0, ok))
+        conn.close()
+
+    def _record_error(self, message: str):
+        self.error_messages[message] = self.error_messages.get(message, 0) + 1
+
+def run_load(url: str, mix: Dict[str, int], concurrency: int, duration: float, max_requests: Optional[int],
+             warmup: float, seed: int, timeout: float) -> Dict:
+    parsed = urlparse(url)
+    host, port = parsed.hostname, parsed.port or 80
+    scenarios, weights = list(mix), list(mix.values())
+
+    if warmup > 0:
+        print(f"Warming up for {warmup:.0f}s...")
+        counter, lock = {'issued': 0}, threading.Lock()
+        deadline = time.perf_counter() + warmup
+        warmers = [LoadWorker(host, port, scenarios, weights, deadline, None, counter, lock, seed + i, timeout) for i in range(concurrency)]
+        for worker in warmers:
+            worker.start()
+        for worker in warmers:
+            worker.join()
+
+    print(f"Running {concurrency} concurrent clients for {'%d requests' % max_requests if max_requests else '%.0fs' % duration}...")
+    counter, lock = {'issued': 0}, threading.Lock()
+    start = time.perf_counter()
+    deadline = start + (duration if not max_requests else float('inf'))
+    workers = [LoadWorker(host, port, scenarios, weights, deadline, max_requests, counter, lock, seed + 1000 + i, timeout) for i in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for worker in workers for sample in worker.samples]
+    error_messages: Dict[str, int] = {}
+    for worker in workers:
+        for message, count in worker.error_messages.items():
+            error_messages[message] = error_messages.get(message, 0) + count
+
+    return {
+        'elapsed_seconds': elapsed,
+        'overall': summarize(samples, elapsed),
+        'by_scenario': {
+            scenario: summarize([s for s in samples if s[0] == scenario], elapsed)
+            for scenario in scenarios
+        },
+        'error_messages': error_messages,
+    }
+
+def format_ms(value: Optional[float]) -> str:
+    return f"{value:8.2f}" if value is not None else "     n/a"
+
+def print_report(report: Dict):
+    header = f"{'scenario':<15}{'requests':>10}{'rps':>10}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print()
+    print(header)
+    print('-' * len(header))
+    rows = list(report['by_scenario'].items()) + [('TOTAL', report['overall'])]
+    for name, stats in rows:
+        latency = stats['latency_ms']
+        print(
+            f"{name:<15}{stats['requests']:>10}{stats['throughput_rps']:>10.1f}{stats['error_rate'] * 100:>8.2f}"
+            f"  {format_ms(latency['p50'])}  {format_ms(latency['p95'])}  {format_ms(latency['p99'])}  {format_ms(latency['max'])}"
+        )
+    if report['error_messages']:
+        print(f"\nErrors: {report['error_messages']}")
+
+def print_comparison(report: Dict, baseline: Dict):
+    def delta(new, old):
+        if new is None or old is None or old == 0:
+            return '     n/a'
+        return f"{(new - old) / old * 100:+7.1f}%"
+
+    print(f"\nComparison with '{baseline.get('label')}' ({baseline.get('timestamp')}):")
+    print(f"{'scenario':<15}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name in list(report['by_scenario']) + ['TOTAL']:
+        new = report['overall'] if name == 'TOTAL' else report['by_scenario'].get(name)
+        old = baseline['overall'] if name == 'TOTAL' else baseline.get('by_scenario', {}).get(name)
+        if not new or not old:
+            continue
+        print(
+            f"{name:<15}{delta(new['throughput_rps'], old['throughput_rps']):>10}"
+            f"{delta(new['latency_ms']['p50'], old['latency_ms']['p50']):>10}"
+            f"{delta(new['latency_ms']['p95'], old['latency_ms']['p95']):>10}"
+            f"{delta(new['latency_ms']['p99'], old['latency_ms']['p99']):>10}"
+        )
+
+def save_report(report: Dict, output: Optional[str]) -> str:
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{report['timestamp'].replace(':', '-')}-{report['label']}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return output
+
+def spawn_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATA_BACKEND='sqlite', SCHEDULER_ENABLED='false')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready within 30 seconds")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Internship Aggregator API.")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the API under test.")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30, help="Seconds to run (ignored when --requests is set).")
+    parser.add_argument('--requests', type=int, default=None, help="Stop after this many requests.")
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help="Weighted scenarios, e.g. 'list=3,search=5,stats=1'. Available: " + ', '.join(DEFAULT_MIX))
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--label', default='run', help="Name stored with the results.")
+    parser.add_argument('--output', default=None, help="Results file (defaults to loadtest/results/<timestamp>-<label>.json).")
+    parser.add_argument('--compare', default=None, help="Previous results file to compare against.")
+    parser.add_argument('--spawn-server', action='store_true',
+                        help="Start a local uvicorn worker on the --url port with DATA_BACKEND=sqlite.")
+    args = parser.parse_args()
+
+    server = spawn_server(urlparse(args.url).port or 80) if args.spawn_server else None
+    try:
+        result = run_load(args.url, args.mix, args.concurrency, args.duration, args.requests, args.warmup, args.seed, args.timeout)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        'label': args.label,
+        'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {
+            'url': args.url,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'mix': args.mix,
+            'seed': args.seed,
+        },
+        **result,
+    }
+
+    print_report(report)
+    print(f"\nResults saved to {save_report(report, args.output)}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Fills the local SQLite database (SQLITE_DB_PATH) with synthetic internships
+so the API can be load tested without Supabase:
+
+    python loadtest/seed_sqlite.py --count 20000
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import random
+from datetime import datetime, timedelta
+from utils.sqlite_db_client import SQLiteDatabaseClient
+from utils.data_normalizer import DataNormalizer
+
+TITLE_PREFIXES = ['Stage', 'Stage PFE', 'Internship', 'Summer Internship', 'Stagiaire', 'Intern']
+TITLE_ROLES = [
+    'Software Engineer', 'Data Analyst', 'Machine Learning Engineer', 'Web Developer',
+    'Développeur Full Stack', 'Data Scientist', 'DevOps Engineer', 'Business Analyst',
+    'Ingénieur Big Data', 'Frontend Developer', 'Backend Developer', 'QA Engineer',
+]
+COMPANIES = [
+    'OCP Group', 'Attijariwafa Bank', 'Capgemini', 'CGI', 'Inwi', 'Orange', 'Maroc Telecom',
+    'Deloitte', 'Sopra Steria', 'Atos', 'Société Générale', 'Dell', 'Oracle', 'Accenture',
+    'BMCE Bank', 'Renault', 'Stellantis', 'Lydec', 'Jumia', 'Avito',
+]
+LOCATIONS = ['Casablanca', 'Rabat', 'Marrakech', 'Tanger', 'Agadir', 'Fes', 'Remote', 'Paris, France', 'Lyon, France']
+SOURCES = ['LinkedIn', 'Rekrute', 'RemoteOK']
+
+def generate_internships(count: int, seed: int):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for index in range(count):
+        title = f"{rng.choice(TITLE_PREFIXES)} {rng.choice(TITLE_ROLES)}"
+        company = rng.choice(COMPANIES)
+        yield {
+            'job_title': f"{title} #{index}",
+            'company_name': company,
+            'location': rng.choice(LOCATIONS),
+            'date_posted': (now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))).isoformat(),
+            'employment_type': 'Internship',
+            'job_description': f"{title} at {company}. " * rng.randint(1, 20),
+            'apply_link': f"https://example.com/jobs/{index}",
+            'source_site': rng.choice(SOURCES),
+            'salary': 'Not specified',
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the local SQLite database with synthetic internships.")
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    db_client = SQLiteDatabaseClient()
+    normalizer = DataNormalizer()
+
+    batch, inserted = [], 0
+    for raw in generate_internships(args.count, args.seed):
+        batch.append(raw)
+        if len(batch) >= args.batch_size:
+            inserted += db_client.insert_internships_batch(normalizer.normalize_internship_batch(batch))
+            batch = []
+    if batch:
+        inserted += db_client.insert_internships_batch(normalizer.normalize_internship_batch(batch))
+
+    log_id = db_client.log_scrape_start('Seed')
+    db_client.log_scrape_end(log_id, inserted, 'success')
+    print(f"Seeded {inserted} internships into {db_client.db_path}")
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,40 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from typing import Optional
-import threading
-from utils.db_client import DatabaseClient
+import asyncio
+import os
+import random
+from utils.db_client import create_database_client
 from scheduler import ScraperScheduler
+from utils.internship_feed import InternshipFeed
+from utils.broadcaster import format_sse
+from utils.ttl_cache import TTLCache
+from utils.prefix_index import SuggestionIndex
+from utils.profiling import ProfileSession
+from config import SCHEDULER_ENABLED, FEED_KEEPALIVE_SECONDS, FACET_TOP_N, FACET_CACHE_TTL_SECONDS, FACET_CACHE_MAX_ENTRIES
+from config import SUGGEST_MAX_TERMS, SUGGEST_REFRESH_SECONDS, SUGGEST_REBUILD_SECONDS
+from config import PROFILING_ENABLED, PROFILE_SAMPLE_RATE
 import uvicorn
 
-db_client = DatabaseClient()
+db_client = create_database_client()
 scheduler = ScraperScheduler()
+internship_feed = InternshipFeed(db_client)
+facet_cache = TTLCache(FACET_CACHE_TTL_SECONDS, FACET_CACHE_MAX_ENTRIES)
+suggestion_index = SuggestionIndex(db_client, SUGGEST_MAX_TERMS, SUGGEST_REFRESH_SECONDS, SUGGEST_REBUILD_SECONDS)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Starting Internship Aggregator API...")
-    scheduler.start()
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+    else:
+        print("ℹ️ Scheduler disabled in this process (SCHEDULER_ENABLED=false). Run worker.py to schedule scrapes.")
+    suggestion_index.refresh_in_background()
     yield
     print("🛑 Shutting down Internship Aggregator API...")
+    await internship_feed.stop()
     scheduler.stop()
 
 app = FastAPI(
@@ -33,6 +52,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if PROFILING_ENABLED:
+    # Only registered when enabled, so requests pay nothing otherwise. Handlers
+    # run on the event loop thread, so the profile covers them and their
+    # DatabaseClient calls (and any request running concurrently on the loop).
+    @app.middleware("http")
+    async def profile_requests(request: Request, call_next):
+        if request.headers.get("x-profile") != "1" and random.random() >= PROFILE_SAMPLE_RATE:
+            return await call_next(request)
+
+        with ProfileSession(f"api-{request.method}-{request.url.path}") as session:
+            response = await call_next(request)
+        if session.prof_path:
+            response.headers["X-Profile-File"] = os.path.basename(session.prof_path)
+        return response
+
 @app.get("/")
 async def root():
     return {"message": "Internship Aggregator API is running"}
@@ -55,10 +89,74 @@ async def search_internships(
     keyword: Optional[str] = Query(None),
     location: Optional[str] = Query(None),  
     source_site: Optional[str] = Query(None),
-    limit: Optional[int] = Query(50, ge=1, le=200)
+    limit: Optional[int] = Query(50, ge=1, le=200),
+    facets: bool = Query(False)
 ):
     results = db_client.search_internships(keyword, location, source_site, limit) 
-    return {"count": len(results), "data": results}
+    response = {"count": len(results), "data": results}
+    if facets:
+        response["facets"] = get_cached_facets(keyword, location, source_site)
+    return response
+
+def get_cached_facets(keyword: Optional[str], location: Optional[str], source_site: Optional[str]) -> dict:
+    # Keyed on the exact filters sent to the RPC (and to search_internships),
+    # so a cached entry always describes the results it is returned with.
+    cache_key = (keyword or '', location or '', source_site or '')
+    cached = facet_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    facet_counts = db_client.get_search_facets(keyword, location, source_site, FACET_TOP_N)
+    if not facet_counts.get("error"):
+        facet_cache.set(cache_key, facet_counts)
+    return facet_counts
+
+@app.get("/internships/suggest")
+async def suggest_internships(
+    q: str = Query(..., min_length=1, max_length=100),
+    field: Optional[str] = Query(None, pattern="^(job_title|company_name|location)$"),
+    limit: int = Query(5, ge=1, le=20)
+):
+    suggestion_index.refresh_in_background()
+    fields = [field] if field else SuggestionIndex.FIELDS
+    return {"query": q, "suggestions": suggestion_index.suggest(q, limit, fields)}
+
+@app.get("/internships/stream")
+async def stream_internships(request: Request):
+    """
+    Server-Sent Events feed. Emits an `internship` event for each newly
+    ingested listing, then a `version` event carrying the latest id. Clients
+    that fall too far behind receive a `dropped` event and should reconnect
+    and refetch.
+    """
+    subscription = internship_feed.subscribe()
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            if internship_feed.version is not None:
+                yield format_sse({"version": internship_feed.version}, event="version", event_id=internship_feed.version)
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=FEED_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+
+                if subscription.dropped:
+                    yield format_sse({"reason": "Client too slow, events were dropped."}, event="dropped")
+                    break
+                yield format_sse(event["data"], event=event["event"], event_id=event["id"])
+        finally:
+            internship_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/internships/stats")
 async def get_internship_stats():
@@ -76,14 +174,39 @@ async def get_last_update():
     return last_scrape or {"message": "No scrapes recorded yet."}
 
 @app.post("/scrape/trigger")
-async def trigger_scrape():
+async def trigger_scrape(profile: bool = Query(False)):
     print("📡 Manual scrape triggered via API.")
-    thread = threading.Thread(target=scheduler.scrape_all_sites)
-    thread.start()
+    job, created = scheduler.scrape_all_sites(trigger='manual', profile=profile)
+    if not created:
+        return {
+            "status": "already_running",
+            "job_id": job["job_id"],
+            "message": "A scrape is already in progress. Poll the existing job for progress."
+        }
     return {
         "status": "success",
-        "message": "Scrape initiated in the background. Check logs for progress."
+        "job_id": job["job_id"],
+        "message": "Scrape queued; the active scheduler starts it within seconds. Poll /scrape/jobs/{job_id} for progress."
     }
 
+@app.get("/scrape/jobs")
+async def list_scrape_jobs():
+    jobs = scheduler.jobs.list()
+    return {"count": len(jobs), "data": jobs}
+
+@app.get("/scrape/jobs/{job_id}")
+async def get_scrape_job(job_id: str):
+    job = scheduler.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scrape job not found.")
+    return job
+
+@app.post("/scrape/jobs/{job_id}/cancel")
+async def cancel_scrape_job(job_id: str):
+    job = scheduler.jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scrape job not found.")
+    return job
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,11 +1,19 @@
 import sys
 import os
-import subprocess
-import threading
-from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from config import SCRAPE_INTERVAL_HOURS, SCRAPE_KEYWORDS, SCRAPE_LOCATIONS
+from config import SCRAPE_INTERVAL_HOURS, SCHEDULER_LOCK_FILE, SCHEDULER_LEADER_RETRY_SECONDS, SCRAPE_QUEUE_POLL_SECONDS
+from config import (
+    RETENTION_ENABLED,
+    RETENTION_MAX_AGE_DAYS,
+    RETENTION_UNSEEN_CYCLES,
+    RETENTION_BATCH_SIZE,
+    RETENTION_MAX_BATCHES_PER_RUN,
+)
+from typing import Dict, Tuple
+from job_manager import ScrapeJobManager
+from utils.file_lock import FileLock
+from utils.db_client import create_database_client
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
@@ -15,65 +23,58 @@ class ScraperScheduler:
     def __init__(self):
         self.scheduler = BackgroundScheduler(daemon=True)
         self.scraper_names = ['LinkedIn', 'Rekrute', 'RemoteOK']
-        self.is_scraping = False
+        self.jobs = ScrapeJobManager(self.scraper_names)
+        self.leader_lock = FileLock(SCHEDULER_LOCK_FILE)
+        self.db_client = None
 
-    def run_scraper_in_subprocess(self, scraper_name: str):
-        script_path = os.path.join(BASE_DIR, 'scrapers', f'run_{scraper_name.lower()}.py')
-        
-        if not os.path.exists(script_path):
-            print(f"❌ Erreur: Le script {script_path} n'a pas été trouvé.")
-            return
+    @property
+    def is_scraping(self) -> bool:
+        return self.jobs.is_running
 
-        print(f"--- Démarrage du scraper: {scraper_name} ---")
-        try:
-            result = subprocess.run(
-                [sys.executable, script_path],
-                capture_output=True,
-                text=True,
-                timeout=1800, 
-                check=True,
-                encoding='utf-8'
-            )
-            print(f"--- Sortie de {scraper_name}: ---")
-            print(result.stdout)
-            print(f"--- {scraper_name} terminé ---")
+    @property
+    def is_leader(self) -> bool:
+        return self.leader_lock.is_held
 
-        except subprocess.TimeoutExpired:
-            print(f"❌ {scraper_name} a expiré (timeout de 30 minutes).")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ {scraper_name} a échoué avec le code {e.returncode}:")
-            print(e.stderr)
-        except Exception as e:
-            print(f"❌ Erreur inconnue lors de l'exécution de {scraper_name}: {e}")
+    def scrape_all_sites(self, trigger: str = 'scheduled', profile: bool = False) -> Tuple[Dict, bool]:
+        """
+        Queues a scrape and, in the active scheduler, starts it right away.
+        Other processes leave it for the active scheduler to pick up.
+        """
+        job, created = self.jobs.submit(trigger, profile)
+        if not created:
+            print(f"ℹ️ Un scraping est déjà en cours (job {job['job_id']}). Annulation du nouveau déclenchement.")
+        if self.is_leader:
+            self.jobs.run_pending()
+        return job, created
 
-    def scrape_all_sites(self):
-        if self.is_scraping:
-            print("ℹ️ Un scraping est déjà en cours. Annulation du nouveau déclenchement.")
-            return
+    def archive_stale_internships(self) -> int:
+        """Moves expired listings to the archive table, one bounded batch at a time."""
+        max_age_days = RETENTION_MAX_AGE_DAYS or None
+        unseen_cycles = RETENTION_UNSEEN_CYCLES or None
+        if max_age_days is None and unseen_cycles is None:
+            return 0
+        if self.db_client is None:
+            self.db_client = create_database_client()
 
-        self.is_scraping = True
-        start_time = datetime.utcnow()
-        print(f"\n{'='*60}")
-        print(f"🚀 Démarrage du scraping de tous les sites à {start_time.strftime('%Y-%m-%d %H:%M:%S')} UTC")
-        print(f"Mots-clés: {SCRAPE_KEYWORDS}")
-        print(f"Lieux: {SCRAPE_LOCATIONS}")
-        print(f"{'='*60}\n")
+        archived = 0
+        for _ in range(RETENTION_MAX_BATCHES_PER_RUN):
+            moved = self.db_client.archive_stale_internships(max_age_days, unseen_cycles, RETENTION_BATCH_SIZE)
+            archived += moved
+            if moved < RETENTION_BATCH_SIZE:
+                break
+        print(f"🗄️ Rétention: {archived} stages archivés.")
+        return archived
 
-        try:
-            for scraper_name in self.scraper_names:
-                if not self.is_scraping: 
-                    print("🛑 Scraping interrompu.")
-                    break
-                self.run_scraper_in_subprocess(scraper_name)
-        finally:
-            self.is_scraping = False
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
-            print(f"\n{'='*60}")
-            print(f"🏁 Scraping terminé en {duration:.2f} secondes.")
-            print(f"{'='*60}\n")
+    def try_become_leader(self) -> bool:
+        """Takes the scheduler lock if it is free and schedules the periodic scrape."""
+        if self.is_leader:
+            return True
+        if not self.leader_lock.acquire():
+            return False
+
+        if self.scheduler.get_job('leader_election'):
+            self.scheduler.remove_job('leader_election')
 
-    def start(self):
         self.scheduler.add_job(
             func=self.scrape_all_sites,
             trigger=IntervalTrigger(hours=SCRAPE_INTERVAL_HOURS),
@@ -81,15 +82,45 @@ class ScraperScheduler:
             name='Scraper les stages de toutes les sources',
             replace_existing=True,
         )
-        
-        print("📡 Lancement du scraping initial dans un thread d'arrière-plan...")
-        initial_scrape_thread = threading.Thread(target=self.scrape_all_sites, daemon=True)
-        initial_scrape_thread.start()
+        self.scheduler.add_job(
+            func=self.jobs.run_pending,
+            trigger=IntervalTrigger(seconds=SCRAPE_QUEUE_POLL_SECONDS),
+            id='run_pending_scrapes',
+            name='Lancer les scrapings demandés via l\'API',
+            replace_existing=True,
+        )
+        if RETENTION_ENABLED:
+            self.scheduler.add_job(
+                func=self.archive_stale_internships,
+                trigger=IntervalTrigger(hours=SCRAPE_INTERVAL_HOURS),
+                id='archive_stale_internships',
+                name='Archiver les stages expirés',
+                replace_existing=True,
+            )
+        print(f"👑 Verrou du planificateur acquis (pid {os.getpid()}). S'exécutera toutes les {SCRAPE_INTERVAL_HOURS} heures.")
+
+        print("📡 Lancement du scraping initial en arrière-plan...")
+        self.scrape_all_sites(trigger='initial')
+        return True
 
+    def start(self):
         self.scheduler.start()
-        print(f"📅 Planificateur démarré. S'exécutera toutes les {SCRAPE_INTERVAL_HOURS} heures.")
+
+        if not self.try_become_leader():
+            print(f"⏸️ Un autre processus détient le verrou du planificateur. Nouvelle tentative toutes les {SCHEDULER_LEADER_RETRY_SECONDS} secondes.")
+            self.scheduler.add_job(
+                func=self.try_become_leader,
+                trigger=IntervalTrigger(seconds=SCHEDULER_LEADER_RETRY_SECONDS),
+                id='leader_election',
+                name='Élection du planificateur actif',
+                replace_existing=True,
+            )
+
+        print("📅 Planificateur démarré.")
 
     def stop(self):
-        self.is_scraping = False 
-        self.scheduler.shutdown()
-        print("🛑 Planificateur arrêté.")
\ No newline at end of file
+        self.jobs.cancel_all()
+        if self.scheduler.running:
+            self.scheduler.shutdown()
+        self.leader_lock.release()
+        print("🛑 Planificateur arrêté.")
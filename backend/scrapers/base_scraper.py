@@ -1,30 +1,64 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 import scrapy
 from scrapy.crawler import CrawlerProcess
-from utils.db_client import DatabaseClient
+from utils.db_client import create_database_client
 from utils.data_normalizer import DataNormalizer
+from utils.detail_enricher import DetailPageEnricher
+from utils.profiling import ProfileSession
+from config import ENRICHMENT_ENABLED, SCRAPER_PROFILE, RETENTION_ENABLED, RETENTION_MAX_AGE_DAYS
 
 class BaseScraper(ABC):
     def __init__(self, source_site: str):
         self.source_site = source_site
-        self.db_client = DatabaseClient()
+        self.db_client = create_database_client()
         self.normalizer = DataNormalizer()
+        self.enricher = DetailPageEnricher(self.db_client) if ENRICHMENT_ENABLED else None
         self.results = []
 
     @abstractmethod
     def get_spider_class(self):
         pass
 
+    @staticmethod
+    def drop_expired(internships: List[Dict]) -> List[Dict]:
+        """
+        Skips listings the retention policy would archive straight away, so
+        they are not re-inserted (and re-archived) on every cycle.
+        """
+        if not RETENTION_ENABLED or not RETENTION_MAX_AGE_DAYS:
+            return internships
+
+        cutoff = datetime.utcnow() - timedelta(days=RETENTION_MAX_AGE_DAYS)
+        kept = []
+        for item in internships:
+            try:
+                posted = datetime.fromisoformat(item['date_posted'])
+            except (KeyError, TypeError, ValueError):
+                kept.append(item)
+                continue
+            if posted.tzinfo is not None:
+                posted = posted.astimezone(timezone.utc).replace(tzinfo=None)
+            if posted >= cutoff:
+                kept.append(item)
+        return kept
+
     def save_results(self, raw_results: List[Dict]) -> int:
         log_id = self.db_client.log_scrape_start(self.source_site)
         inserted_count = 0
         try:
             if not raw_results:
-                self.db_client.log_scrape_end(log_id, 0, 'success')
+                # Not 'success': an empty run (often a blocked crawl) must not
+                # count as a retention cycle that failed to see every listing.
+                self.db_client.log_scrape_end(log_id, 0, 'empty')
                 return 0
 
-            normalized_results = self.normalizer.normalize_internship_batch(raw_results)
+            normalized_results = self.drop_expired(self.normalizer.normalize_internship_batch(raw_results))
+            if len(normalized_results) < len(raw_results):
+                print(f"[{self.source_site}] Skipped {len(raw_results) - len(normalized_results)} listings older than {RETENTION_MAX_AGE_DAYS} days.")
+            if self.enricher:
+                normalized_results = self.enricher.enrich(normalized_results)
             inserted_count = self.db_client.insert_internships_batch(normalized_results)
             self.db_client.log_scrape_end(log_id, inserted_count, 'success')
             return inserted_count
@@ -32,7 +66,13 @@ class BaseScraper(ABC):
             self.db_client.log_scrape_end(log_id, inserted_count, 'failed', str(e))
             raise e
 
-    def run(self, keywords: List[str], locations: List[str]) -> int:
+    def run(self, keywords: List[str], locations: List[str], profile: bool = SCRAPER_PROFILE) -> int:
+        if profile:
+            with ProfileSession(f"scraper-{self.source_site}"):
+                return self._run(keywords, locations)
+        return self._run(keywords, locations)
+
+    def _run(self, keywords: List[str], locations: List[str]) -> int:
         print(f"[{self.source_site}] Starting scrape...")
         
         spider_class = self.get_spider_class()
@@ -3,12 +3,12 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from scrapers.linkedin_scraper import LinkedInScraper
-from config import SCRAPE_KEYWORDS, SCRAPE_LOCATIONS
+from config import SCRAPE_KEYWORDS, SCRAPE_LOCATIONS, SCRAPER_PROFILE
 
 if __name__ == '__main__':
     try:
         scraper = LinkedInScraper()
-        count = scraper.run(keywords=SCRAPE_KEYWORDS, locations=SCRAPE_LOCATIONS)
+        count = scraper.run(keywords=SCRAPE_KEYWORDS, locations=SCRAPE_LOCATIONS, profile=SCRAPER_PROFILE or '--profile' in sys.argv)
         print(f"\n[SUCCESS] LinkedIn scraper finished. Inserted {count} new internships.")
         sys.exit(0)
     except Exception as e:
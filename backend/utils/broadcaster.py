@@ -0,0 +1,51 @@
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+
+class Subscription:
+    """A single consumer of a Broadcaster, with its own bounded buffer."""
+
+    def __init__(self, max_buffer: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+        self.dropped = False
+
+class Broadcaster:
+    """
+    In-process fan-out of events to many subscribers. Publishing never
+    blocks: a subscriber whose buffer is full is dropped instead of slowing
+    down everyone else. Must be used from the event loop thread.
+    """
+
+    def __init__(self, max_buffer: int):
+        self.max_buffer = max_buffer
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.max_buffer)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: Dict[str, Any]):
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.dropped = True
+                self._subscribers.discard(subscription)
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[Any] = None) -> str:
+    """Serializes one Server-Sent Events message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
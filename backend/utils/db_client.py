@@ -1,7 +1,8 @@
+import os
 from supabase import create_client, Client
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from datetime import datetime
-from config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
+from config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, FEED_MARKER_FILE, DATA_BACKEND
 
 class DatabaseClient:
     def __init__(self):
@@ -26,11 +27,77 @@ class DatabaseClient:
             
             inserted_count = len(result.data)
             print(f"[DB] Database insert/upsert complete. New records: {inserted_count}") 
+            self.mark_internships_seen([item['content_hash'] for item in internships])
+            if inserted_count:
+                self._touch_feed_marker()
             return inserted_count
         except Exception as e:
             print(f"[DB] Database batch insert failed: {e}") 
             return 0
 
+    def mark_internships_seen(self, content_hashes: List[str]):
+        """Refreshes last_seen_at for listings found again by a scrape (see retention)."""
+        seen_at = datetime.utcnow().isoformat()
+        try:
+            for start in range(0, len(content_hashes), 200):
+                chunk = content_hashes[start:start + 200]
+                self.client.table('internships').update({'last_seen_at': seen_at}).in_('content_hash', chunk).execute()
+        except Exception as e:
+            print(f"[DB] Failed to update last_seen_at: {e}")
+
+    def archive_stale_internships(self, max_age_days: Optional[int], unseen_cycles: Optional[int], batch_size: int) -> int:
+        """
+        Moves one batch of expired listings to internships_archive and returns
+        how many were moved. Relies on the 'archive_stale_internships' RPC.
+        """
+        try:
+            response = self.client.rpc('archive_stale_internships', {
+                'p_max_age_days': max_age_days,
+                'p_unseen_cycles': unseen_cycles,
+                'p_batch_size': batch_size,
+            }).execute()
+            return response.data or 0
+        except Exception as e:
+            print(f"[DB] Error archiving stale internships: {e}. Ensure the 'archive_stale_internships' RPC function exists in your database.")
+            return 0
+
+    def _touch_feed_marker(self):
+        """Signals API processes on this host that new internships were committed."""
+        try:
+            with open(FEED_MARKER_FILE, 'a'):
+                os.utime(FEED_MARKER_FILE, None)
+        except OSError:
+            pass
+
+    def get_latest_internship_id(self) -> Optional[int]:
+        try:
+            response = self.client.table('internships').select('id').order('id', desc=True).limit(1).execute()
+            return response.data[0]['id'] if response.data else 0
+        except Exception as e:
+            print(f"Error fetching latest internship id: {e}")
+            return None
+
+    def get_internships_since(self, last_id: int, limit: int = 200, columns: str = '*') -> List[Dict]:
+        """Retrieves internships inserted after the given id, oldest first."""
+        try:
+            response = self.client.table('internships').select(columns).gt('id', last_id).order('id').limit(limit).execute()
+            return response.data or []
+        except Exception as e:
+            print(f"Error fetching new internships: {e}")
+            return []
+
+    def get_existing_content_hashes(self, content_hashes: List[str]) -> Set[str]:
+        """Returns the subset of the given hashes that are already stored."""
+        existing = set()
+        try:
+            for start in range(0, len(content_hashes), 200):
+                chunk = content_hashes[start:start + 200]
+                response = self.client.table('internships').select('content_hash').in_('content_hash', chunk).execute()
+                existing.update(row['content_hash'] for row in response.data or [])
+        except Exception as e:
+            print(f"Error checking existing internships: {e}")
+        return existing
+
     def get_all_internships(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Retrieves internships with pagination."""
         try:
@@ -54,6 +121,9 @@ class DatabaseClient:
                 
                 query = query.or_(f"job_title.ilike.{search_term},location.ilike.{search_term}")
             
+            if location:
+                query = query.ilike('location', f'%{location}%')
+
             if source_site:
                 query = query.eq('source_site', source_site)
             
@@ -66,6 +136,26 @@ class DatabaseClient:
             print(f"Error searching internships: {e}")
             return []
 
+    def get_search_facets(self, keyword: Optional[str], location: Optional[str], source_site: Optional[str], top_n: int = 20) -> Dict:
+        """
+        Counts search matches by source, location, company and posting age
+        in a single RPC call, using the same filters as search_internships.
+        """
+        try:
+            response = self.client.rpc('get_internship_facets', {
+                'p_keyword': keyword or None,
+                'p_location': location or None,
+                'p_source_site': source_site or None,
+                'p_top_n': top_n,
+            }).execute()
+            data = response.data
+            if isinstance(data, list):
+                data = data[0] if data else {}
+            return data or {}
+        except Exception as e:
+            print(f"Error fetching search facets: {e}. Ensure the 'get_internship_facets' RPC function exists in your database.")
+            return {"error": str(e)}
+
     def get_aggregated_stats(self) -> Dict:
         """
         Performs efficient aggregation directly in the database.
@@ -104,4 +194,11 @@ class DatabaseClient:
             response = self.client.table('scrape_logs').select('*').order('started_at', desc=True).limit(1).execute()
             return response.data[0] if response.data else None
         except Exception:
-            return None
\ No newline at end of file
+            return None
+
+def create_database_client() -> DatabaseClient:
+    """Returns the database client for the configured DATA_BACKEND."""
+    if DATA_BACKEND == 'sqlite':
+        from utils.sqlite_db_client import SQLiteDatabaseClient
+        return SQLiteDatabaseClient()
+    return DatabaseClient()
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from scrapy.selector import Selector
+from config import (
+    ENRICHMENT_CONCURRENCY,
+    ENRICHMENT_DOMAIN_DELAY_SECONDS,
+    ENRICHMENT_MAX_PAGES_PER_RUN,
+    ENRICHMENT_CACHE_DIR,
+    ENRICHMENT_CACHE_TTL_HOURS,
+    ENRICHMENT_TIMEOUT_SECONDS,
+)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
+
+# Detail page selectors for the full description, tried in order. Sources not
+# listed here (e.g. RemoteOK, whose API already returns the full text) are skipped.
+DESCRIPTION_SELECTORS = {
+    'LinkedIn': ['div.show-more-less-html__markup', 'div.description__text'],
+    'Rekrute': ['#recruiterDescription', 'div[itemprop="description"]', 'div.contentbloc'],
+}
+
+class DomainRateLimiter:
+    """Spaces out requests to the same domain, across all worker threads."""
+
+    def __init__(self, delay_seconds: float):
+        self.delay_seconds = delay_seconds
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, domain: str):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.delay_seconds
+        if slot > now:
+            time.sleep(slot - now)
+
+class DetailPageEnricher:
+    """
+    Replaces teaser descriptions with the full text from each listing's
+    detail page. Only listings whose content_hash is not stored yet are
+    fetched, with bounded concurrency and a per-domain rate limit, and pages
+    are cached on disk so re-runs do not hit the sites again. Expired cache
+    files are removed at the start of each run.
+    """
+
+    def __init__(self, db_client):
+        self.db_client = db_client
+        self.rate_limiter = DomainRateLimiter(ENRICHMENT_DOMAIN_DELAY_SECONDS)
+        os.makedirs(ENRICHMENT_CACHE_DIR, exist_ok=True)
+
+    def enrich(self, internships: List[Dict]) -> List[Dict]:
+        self._sweep_cache()
+        candidates = [
+            item for item in internships
+            if item.get('source_site') in DESCRIPTION_SELECTORS and item.get('apply_link')
+        ]
+        if not candidates:
+            return internships
+
+        existing_hashes = self.db_client.get_existing_content_hashes([item['content_hash'] for item in candidates])
+        pending: Dict[str, List[Dict]] = {}
+        for item in candidates:
+            if item['content_hash'] not in existing_hashes:
+                pending.setdefault(item['content_hash'], []).append(item)
+        groups = list(pending.values())[:ENRICHMENT_MAX_PAGES_PER_RUN]
+        if not groups:
+            return internships
+
+        print(f"[Enrichment] Fetching {len(groups)} detail pages ({len(existing_hashes)} listings already stored)...")
+        with ThreadPoolExecutor(max_workers=ENRICHMENT_CONCURRENCY) as pool:
+            descriptions = list(pool.map(self._fetch_description, [group[0] for group in groups]))
+
+        enriched = 0
+        for group, description in zip(groups, descriptions):
+            if description and len(description) > len(group[0].get('job_description') or ''):
+                for item in group:
+                    item['job_description'] = description
+                enriched += 1
+
+        print(f"[Enrichment] Enriched {enriched}/{len(groups)} descriptions.")
+        return internships
+
+    def _fetch_description(self, item: Dict) -> Optional[str]:
+        html = self._fetch_page(item['apply_link'])
+        if not html:
+            return None
+
+        selector = Selector(text=html)
+        for css in DESCRIPTION_SELECTORS[item['source_site']]:
+            text = ' '.join(selector.css(f'{css} ::text').getall())
+            text = re.sub(r'\s+', ' ', text).strip()
+            if text:
+                return text
+        return None
+
+    def _sweep_cache(self):
+        """Deletes cached pages older than the TTL; they would be refetched anyway."""
+        expires_before = time.time() - ENRICHMENT_CACHE_TTL_HOURS * 3600
+        removed = 0
+        try:
+            with os.scandir(ENRICHMENT_CACHE_DIR) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.html'):
+                        continue
+                    try:
+                        if entry.stat().st_mtime < expires_before:
+                            os.remove(entry.path)
+                            removed += 1
+                    except OSError:
+                        # Another scraper process may have swept or rewritten it.
+                        pass
+        except OSError as e:
+            print(f"[Enrichment] Could not sweep page cache: {e}")
+            return
+        if removed:
+            print(f"[Enrichment] Removed {removed} expired cached pages.")
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(ENRICHMENT_CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html')
+
+    def _fetch_page(self, url: str) -> Optional[str]:
+        cache_path = self._cache_path(url)
+        try:
+            if time.time() - os.path.getmtime(cache_path) < ENRICHMENT_CACHE_TTL_HOURS * 3600:
+                with open(cache_path, encoding='utf-8') as f:
+                    return f.read()
+        except OSError:
+            pass
+
+        self.rate_limiter.wait(urlparse(url).netloc)
+        try:
+            request = urllib.request.Request(url, headers={
+                'User-Agent': USER_AGENT,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
+            })
+            with urllib.request.urlopen(request, timeout=ENRICHMENT_TIMEOUT_SECONDS) as response:
+                charset = response.headers.get_content_charset() or 'utf-8'
+                html = response.read().decode(charset, errors='replace')
+        except Exception as e:
+            print(f"[Enrichment] Failed to fetch {url}: {e}")
+            return None
+
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+        except OSError:
+            pass
+        return html
@@ -0,0 +1,73 @@
+import os
+from typing import Optional, TextIO
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+class FileLock:
+    """
+    Non-blocking, inter-process exclusive lock backed by a file on disk.
+    The lock is held for as long as the file handle stays open, so it is
+    released automatically by the OS if the owning process dies.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle: Optional[TextIO] = None
+
+    @property
+    def is_held(self) -> bool:
+        return self._handle is not None
+
+    def acquire(self, blocking: bool = False) -> bool:
+        """
+        Takes the lock. Returns True if this instance now holds it; without
+        `blocking`, returns False straight away if another holder has it.
+        """
+        if self._handle is not None:
+            return True
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        handle = open(self.path, 'a+')
+        try:
+            if os.name == 'nt':
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._handle = handle
+        return True
+
+    def release(self):
+        if self._handle is None:
+            return
+        try:
+            if os.name == 'nt':
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire(blocking=True)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
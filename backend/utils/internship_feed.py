@@ -0,0 +1,101 @@
+import asyncio
+import os
+from typing import Optional
+from config import FEED_MARKER_FILE, FEED_MARKER_CHECK_SECONDS, FEED_POLL_SECONDS, FEED_MAX_EVENTS_PER_UPDATE, FEED_CLIENT_BUFFER_SIZE
+from utils.broadcaster import Broadcaster, Subscription
+from utils.db_client import DatabaseClient
+
+class InternshipFeed:
+    """
+    Pushes newly ingested internships to stream subscribers.
+
+    Scrapers write to the database from their own subprocesses, so a single
+    watcher task per API process detects new rows and fans them out to every
+    connected client. It checks the marker file touched by
+    DatabaseClient.insert_internships_batch (free on the same host) and falls
+    back to a cheap "latest id" query for writers on other hosts. The watcher
+    only runs while at least one client is connected.
+    """
+
+    def __init__(self, db_client: DatabaseClient):
+        self.db_client = db_client
+        self.broadcaster = Broadcaster(FEED_CLIENT_BUFFER_SIZE)
+        self.version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Subscription:
+        subscription = self.broadcaster.subscribe()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.broadcaster.unsubscribe(subscription)
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    def _marker_mtime() -> float:
+        try:
+            return os.stat(FEED_MARKER_FILE).st_mtime
+        except OSError:
+            return 0.0
+
+    async def _watch(self):
+        # Rows ingested while nobody was connected are not news, so the
+        # version is re-read on every (re)start and forgotten on exit.
+        try:
+            self.version = await asyncio.to_thread(self.db_client.get_latest_internship_id)
+            marker_mtime = self._marker_mtime()
+            loop = asyncio.get_running_loop()
+            last_poll = loop.time()
+
+            while self.broadcaster.subscriber_count:
+                await asyncio.sleep(FEED_MARKER_CHECK_SECONDS)
+
+                current_mtime = self._marker_mtime()
+                if current_mtime == marker_mtime and loop.time() - last_poll < FEED_POLL_SECONDS:
+                    continue
+                marker_mtime = current_mtime
+                last_poll = loop.time()
+
+                try:
+                    await self._publish_new_internships()
+                except Exception as e:
+                    print(f"[Feed] Error while checking for new internships: {e}")
+        finally:
+            self.version = None
+
+    async def _publish_new_internships(self):
+        latest_id = await asyncio.to_thread(self.db_client.get_latest_internship_id)
+        if latest_id is None:
+            return
+        if self.version is None:
+            self.version = latest_id
+            return
+        if latest_id <= self.version:
+            return
+
+        previous_version = self.version
+        new_internships = await asyncio.to_thread(
+            self.db_client.get_internships_since, previous_version, FEED_MAX_EVENTS_PER_UPDATE
+        )
+        for internship in new_internships:
+            self.broadcaster.publish({'event': 'internship', 'id': internship['id'], 'data': internship})
+
+        self.version = latest_id
+        self.broadcaster.publish({
+            'event': 'version',
+            'id': latest_id,
+            'data': {
+                'version': latest_id,
+                'previous_version': previous_version,
+                'pushed': len(new_internships),
+            }
+        })
@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Dict, List, Optional
+from utils.file_lock import FileLock
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+class JobStore:
+    """
+    Scrape job records shared by every process on the host (API workers and
+    the standalone worker), stored as one JSON file per job in a directory.
+    Read-modify-write sequences must run inside `with store.lock():`.
+    """
+
+    def __init__(self, directory: str, history_size: int):
+        self.directory = directory
+        self.history_size = history_size
+        os.makedirs(directory, exist_ok=True)
+
+    def lock(self) -> FileLock:
+        return FileLock(os.path.join(self.directory, '.lock'))
+
+    def _path(self, job_id: str, suffix: str = '.json') -> str:
+        return os.path.join(self.directory, f"{job_id}{suffix}")
+
+    def save(self, record: Dict):
+        path = self._path(record['job_id'])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self._path(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list(self) -> List[Dict]:
+        """Returns all stored jobs, newest first."""
+        records = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                record = self.load(name[:-len('.json')])
+                if record is not None:
+                    records.append(record)
+        records.sort(key=lambda record: record['created_at'], reverse=True)
+        return records
+
+    def find_active(self) -> Optional[Dict]:
+        """Returns the oldest pending or running job, if any."""
+        active = [record for record in self.list() if record['status'] in ACTIVE_STATUSES]
+        return active[-1] if active else None
+
+    def request_cancel(self, job_id: str):
+        """Flags a running job for cancellation by the process that owns it."""
+        with open(self._path(job_id, '.cancel'), 'w'):
+            pass
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        return os.path.exists(self._path(job_id, '.cancel'))
+
+    def prune(self):
+        for record in self.list()[self.history_size:]:
+            if record['status'] not in ACTIVE_STATUSES:
+                for suffix in ('.json', '.cancel'):
+                    try:
+                        os.remove(self._path(record['job_id'], suffix))
+                    except OSError:
+                        pass
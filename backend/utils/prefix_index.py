@@ -0,0 +1,213 @@
+import heapq
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+from config import FEED_MARKER_FILE
+
+WORD_START = re.compile(r'\w+')
+
+# Sorts after any string that starts with a given prefix, so (prefix + KEY_END)
+# is an exclusive upper bound for that prefix's range of keys.
+KEY_END = '\U0010ffff'
+
+class PrefixIndex:
+    """
+    In-memory autocomplete index over a set of terms (titles, companies...).
+
+    Every term is stored once with its frequency, and is reachable from the
+    start of each of its words through a sorted array of (key, term) pairs.
+    Prefixes matching more than HEAVY_RANGE keys get their top TOP_K terms
+    precomputed whenever the index changes, so a lookup is a binary search
+    followed either by a dictionary hit or by a scan of at most HEAVY_RANGE
+    keys. The number of distinct terms is capped; the least frequent ones
+    are evicted first, and among equally frequent terms the ones seen least
+    recently go first, so fresh listings are not dropped on arrival.
+    """
+
+    TOP_K = 20
+    HEAVY_RANGE = 256
+    MAX_PRECOMPUTED_PREFIX = 32
+
+    def __init__(self, max_terms: int):
+        self.max_terms = max_terms
+        # (terms, keys, top): built together by add_many and published in a
+        # single assignment, so readers never pair structures from different
+        # versions of the index.
+        self._snapshot: Tuple[Dict[str, List], List[Tuple[str, str]], Dict[str, List[str]]] = ({}, [], {})
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    @staticmethod
+    def _search_keys(term_id: str) -> List[str]:
+        return [term_id[match.start():] for match in WORD_START.finditer(term_id)]
+
+    def add_many(self, terms: Iterable[str]):
+        # Readers may be searching concurrently, so the published snapshot is
+        # never mutated: a new one is built on the side and swapped in.
+        current_terms, keys, _ = self._snapshot
+        terms_by_id = dict(current_terms)
+        new_keys = []
+        for term in terms:
+            term = (term or '').strip()
+            if not term or term == 'N/A':
+                continue
+            term_id = term.lower()
+            self._seq += 1
+            entry = terms_by_id.get(term_id)
+            if entry is not None:
+                terms_by_id[term_id] = [entry[0], entry[1] + 1, self._seq]
+                continue
+            terms_by_id[term_id] = [term, 1, self._seq]
+            new_keys.extend((key, term_id) for key in self._search_keys(term_id))
+
+        if new_keys:
+            keys = sorted(keys + new_keys)
+        if len(terms_by_id) > self.max_terms:
+            terms_by_id, keys = self._evict(terms_by_id, keys)
+        self._snapshot = (terms_by_id, keys, self._build_top(keys, terms_by_id))
+
+    def _evict(self, terms: Dict[str, List], keys: List[Tuple[str, str]]) -> Tuple[Dict[str, List], List[Tuple[str, str]]]:
+        keep = dict(heapq.nlargest(self.max_terms, terms.items(), key=lambda item: (item[1][1], item[1][2])))
+        return keep, [key for key in keys if key[1] in keep]
+
+    @staticmethod
+    def _ranked(term_ids: Iterable[str], terms: Dict[str, List], limit: int) -> List[str]:
+        return heapq.nlargest(limit, term_ids, key=lambda term_id: (terms[term_id][1], terms[term_id][2]))
+
+    def _build_top(self, keys: List[Tuple[str, str]], terms: Dict[str, List]) -> Dict[str, List[str]]:
+        """
+        Walks the heavy prefixes of the sorted keys, depth first. Each key is
+        scanned once (in the light range or exact-match run that holds it),
+        and a heavy prefix merges the top terms of its children.
+        """
+        top: Dict[str, List[str]] = {}
+
+        def visit(prefix: str, lo: int, hi: int) -> List[str]:
+            if hi - lo <= self.HEAVY_RANGE or len(prefix) >= self.MAX_PRECOMPUTED_PREFIX:
+                return self._ranked({term_id for _, term_id in keys[lo:hi]}, terms, self.TOP_K)
+
+            candidates = set()
+            i = lo
+            while i < hi and len(keys[i][0]) == len(prefix):
+                candidates.add(keys[i][1])
+                i += 1
+            while i < hi:
+                child = keys[i][0][:len(prefix) + 1]
+                j = max(bisect_left(keys, (child + KEY_END, ''), i, hi), i + 1)
+                candidates.update(visit(child, i, j))
+                i = j
+
+            best = self._ranked(candidates, terms, self.TOP_K)
+            if prefix:
+                top[prefix] = best
+            return best
+
+        visit('', 0, len(keys))
+        return top
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """Returns up to `limit` (term, frequency) pairs matching the prefix, most frequent first."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+
+        terms, keys, top = self._snapshot
+        start = bisect_left(keys, (prefix, ''))
+        end = bisect_left(keys, (prefix + KEY_END, ''), lo=start)
+
+        best = top.get(prefix) if limit <= self.TOP_K else None
+        if best is not None:
+            best = best[:limit]
+        else:
+            best = self._ranked({term_id for _, term_id in keys[start:end]}, terms, limit)
+        return [(terms[term_id][0], terms[term_id][1]) for term_id in best]
+
+class SuggestionIndex:
+    """
+    Prefix indexes over job titles, companies and locations, kept in sync
+    with the database. New rows are added incrementally (by id) as soon as a
+    scrape touches the feed marker file, or every `refresh_seconds`, and a
+    periodic full rebuild drops listings that were removed. Refreshes run in
+    a background thread so lookups never wait on the DB.
+    """
+
+    FIELDS = ('job_title', 'company_name', 'location')
+
+    def __init__(self, db_client, max_terms: int, refresh_seconds: float, rebuild_seconds: float, page_size: int = 1000):
+        self.db_client = db_client
+        self.max_terms = max_terms
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.page_size = page_size
+        self.indexes = {field: PrefixIndex(max_terms) for field in self.FIELDS}
+        self.last_id = 0
+        self._last_refresh = float('-inf')
+        self._last_rebuild = float('-inf')
+        self._marker_mtime = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def suggest(self, prefix: str, limit: int, fields: Iterable[str] = FIELDS) -> Dict[str, List[Dict]]:
+        indexes = self.indexes
+        return {
+            field: [{'value': value, 'count': count} for value, count in indexes[field].search(prefix, limit)]
+            for field in fields
+        }
+
+    def refresh_in_background(self):
+        if self._refresh_lock.locked():
+            return
+        try:
+            marker_mtime = os.stat(FEED_MARKER_FILE).st_mtime
+        except OSError:
+            marker_mtime = 0.0
+        if marker_mtime == self._marker_mtime and time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return
+        self._marker_mtime = marker_mtime
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    def refresh(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            self._last_refresh = now
+            if now - self._last_rebuild >= self.rebuild_seconds:
+                self._rebuild()
+                self._last_rebuild = now
+            else:
+                self._load_since(self.last_id, self.indexes)
+        except Exception as e:
+            print(f"[Suggest] Error refreshing suggestion index: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def _rebuild(self):
+        indexes = {field: PrefixIndex(self.max_terms) for field in self.FIELDS}
+        last_id = self._load_since(0, indexes)
+        self.indexes = indexes
+        self.last_id = last_id
+        print("[Suggest] Index rebuilt: " + ', '.join(f"{field}={len(index)}" for field, index in indexes.items()))
+
+    def _load_since(self, last_id: int, indexes: Dict[str, PrefixIndex]) -> int:
+        columns = 'id,' + ','.join(self.FIELDS)
+        new_rows = []
+        while True:
+            rows = self.db_client.get_internships_since(last_id, self.page_size, columns=columns)
+            new_rows.extend(rows)
+            if rows:
+                last_id = rows[-1]['id']
+            if len(rows) < self.page_size:
+                break
+
+        # One add per field, so the precomputed top terms are built once.
+        if new_rows:
+            for field, index in indexes.items():
+                index.add_many(row.get(field) for row in new_rows)
+            if indexes is self.indexes:
+                self.last_id = last_id
+        return last_id
@@ -0,0 +1,105 @@
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL_MS
+
+# cProfile cannot run two profilers at once, so concurrent profiled sections
+# are skipped rather than queued.
+_active_lock = threading.Lock()
+
+class StackSampler(threading.Thread):
+    """
+    Periodically captures the call stack of one thread and counts identical
+    stacks, producing the "folded" format read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._frame_label(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(labels))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ProfileSession:
+    """
+    Context manager that profiles the calling thread with cProfile and a
+    stack sampler, then saves `<name>.prof` (for pstats/snakeviz) and
+    `<name>.folded` (for flame graphs) under PROFILE_DIR. If another section
+    is already being profiled, it does nothing and `prof_path` stays None.
+    """
+
+    def __init__(self, name: str):
+        timestamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        safe_name = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_') or 'profile'
+        self.base_path = os.path.join(PROFILE_DIR, f"{timestamp}-{safe_name}")
+        self.prof_path: Optional[str] = None
+        self.folded_path: Optional[str] = None
+        self.duration_seconds: Optional[float] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started_at = 0.0
+
+    def __enter__(self) -> "ProfileSession":
+        if not _active_lock.acquire(blocking=False):
+            return self
+        try:
+            self._sampler = StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_MS / 1000.0)
+            self._profiler = cProfile.Profile()
+            self._started_at = time.perf_counter()
+            self._sampler.start()
+            self._profiler.enable()
+        except Exception:
+            _active_lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is None:
+            return False
+        try:
+            self._profiler.disable()
+            self._sampler.stop()
+            self.duration_seconds = time.perf_counter() - self._started_at
+
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            self.prof_path = self.base_path + '.prof'
+            self.folded_path = self.base_path + '.folded'
+            self._profiler.dump_stats(self.prof_path)
+            self._sampler.write(self.folded_path)
+            print(f"[Profile] {self.duration_seconds * 1000:.1f} ms profiled, saved to {self.prof_path} and {self.folded_path}")
+        except Exception as e:
+            print(f"[Profile] Failed to save profile: {e}")
+        finally:
+            _active_lock.release()
+        return False
@@ -0,0 +1,328 @@
+import sqlite3
+import threading
+from typing import List, Dict, Optional, Set
+from datetime import datetime
+from config import SQLITE_DB_PATH
+from utils.db_client import DatabaseClient
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS internships (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_title TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    location TEXT,
+    employment_type TEXT DEFAULT 'Internship',
+    job_description TEXT,
+    apply_link TEXT,
+    source_site TEXT NOT NULL,
+    date_posted TEXT,
+    scraped_at TEXT,
+    salary TEXT,
+    content_hash TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+    last_seen_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_internships_source ON internships (source_site);
+CREATE INDEX IF NOT EXISTS idx_internships_date_posted ON internships (date_posted DESC);
+CREATE INDEX IF NOT EXISTS idx_internships_last_seen_at ON internships (last_seen_at);
+
+CREATE TABLE IF NOT EXISTS internships_archive (
+    id INTEGER PRIMARY KEY,
+    job_title TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    location TEXT,
+    employment_type TEXT,
+    job_description TEXT,
+    apply_link TEXT,
+    source_site TEXT NOT NULL,
+    date_posted TEXT,
+    scraped_at TEXT,
+    salary TEXT,
+    content_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL,
+    archived_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+DELETE FROM internships_archive
+WHERE id NOT IN (SELECT MAX(id) FROM internships_archive GROUP BY content_hash);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_internships_archive_content_hash ON internships_archive (content_hash);
+
+CREATE TABLE IF NOT EXISTS scrape_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_site TEXT NOT NULL,
+    status TEXT NOT NULL,
+    internships_found INTEGER DEFAULT 0,
+    started_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+    completed_at TEXT,
+    error_message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_logs_source_started_at ON scrape_logs (source_site, started_at DESC);
+"""
+
+INTERNSHIP_COLUMNS = [
+    'job_title', 'company_name', 'location', 'employment_type', 'job_description',
+    'apply_link', 'source_site', 'date_posted', 'scraped_at', 'salary', 'content_hash',
+]
+
+ARCHIVE_COLUMNS = ', '.join(['id'] + INTERNSHIP_COLUMNS + ['created_at', 'last_seen_at'])
+
+class SQLiteDatabaseClient(DatabaseClient):
+    """
+    Local drop-in replacement for the Supabase-backed client, selected with
+    DATA_BACKEND=sqlite. Used for development and load testing on a single
+    machine without network access to Supabase.
+    """
+
+    def __init__(self, db_path: str = SQLITE_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._connection()
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(internships)')}
+        if columns and 'last_seen_at' not in columns:
+            # Databases created before retention support: SQLite cannot add a
+            # column with a non-constant default, so backfill it instead.
+            conn.execute("ALTER TABLE internships ADD COLUMN last_seen_at TEXT NOT NULL DEFAULT ''")
+            conn.execute("UPDATE internships SET last_seen_at = strftime('%Y-%m-%dT%H:%M:%f', 'now')")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _fetch_all(self, sql: str, params=()) -> List[Dict]:
+        return [dict(row) for row in self._connection().execute(sql, params).fetchall()]
+
+    def insert_internships_batch(self, internships: List[Dict]) -> int:
+        if not internships:
+            return 0
+
+        try:
+            conn = self._connection()
+            placeholders = ', '.join('?' for _ in INTERNSHIP_COLUMNS)
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO internships ({', '.join(INTERNSHIP_COLUMNS)}) VALUES ({placeholders})",
+                [tuple(item.get(column) for column in INTERNSHIP_COLUMNS) for item in internships]
+            )
+            conn.commit()
+
+            inserted_count = conn.total_changes - before
+            print(f"[DB] SQLite insert complete. New records: {inserted_count}")
+            self.mark_internships_seen([item['content_hash'] for item in internships])
+            if inserted_count:
+                self._touch_feed_marker()
+            return inserted_count
+        except Exception as e:
+            print(f"[DB] SQLite batch insert failed: {e}")
+            return 0
+
+    def mark_internships_seen(self, content_hashes: List[str]):
+        seen_at = datetime.utcnow().isoformat()
+        try:
+            conn = self._connection()
+            for start in range(0, len(content_hashes), 500):
+                chunk = content_hashes[start:start + 500]
+                placeholders = ', '.join('?' for _ in chunk)
+                conn.execute(f'UPDATE internships SET last_seen_at = ? WHERE content_hash IN ({placeholders})', [seen_at] + chunk)
+            conn.commit()
+        except Exception as e:
+            print(f"[DB] Failed to update last_seen_at: {e}")
+
+    def archive_stale_internships(self, max_age_days: Optional[int], unseen_cycles: Optional[int], batch_size: int) -> int:
+        clauses, params = [], []
+        if max_age_days is not None:
+            clauses.append("i.date_posted < strftime('%Y-%m-%dT%H:%M:%f', 'now', ?)")
+            params.append(f'-{max_age_days} days')
+        if unseen_cycles is not None:
+            clauses.append("i.last_seen_at < c.unseen_before")
+        if not clauses:
+            return 0
+
+        conn = self._connection()
+        try:
+            ids = [row[0] for row in conn.execute(
+                f"""WITH cutoffs AS (
+                    SELECT source_site, started_at AS unseen_before FROM (
+                        SELECT source_site, started_at,
+                               ROW_NUMBER() OVER (PARTITION BY source_site ORDER BY started_at DESC) AS cycle
+                        FROM scrape_logs WHERE status = 'success'
+                    ) WHERE cycle = ?
+                )
+                SELECT i.id FROM internships AS i LEFT JOIN cutoffs AS c ON c.source_site = i.source_site
+                WHERE {' OR '.join(clauses)} ORDER BY i.id LIMIT ?""",
+                [unseen_cycles or 0] + params + [batch_size]
+            )]
+            if not ids:
+                return 0
+            placeholders = ', '.join('?' for _ in ids)
+            conn.execute(
+                f'INSERT OR REPLACE INTO internships_archive ({ARCHIVE_COLUMNS}) '
+                f'SELECT {ARCHIVE_COLUMNS} FROM internships WHERE id IN ({placeholders})', ids
+            )
+            conn.execute(f'DELETE FROM internships WHERE id IN ({placeholders})', ids)
+            conn.commit()
+            return len(ids)
+        except Exception as e:
+            conn.rollback()
+            print(f"[DB] Error archiving stale internships: {e}")
+            return 0
+
+    def get_latest_internship_id(self) -> Optional[int]:
+        try:
+            row = self._connection().execute('SELECT MAX(id) FROM internships').fetchone()
+            return row[0] or 0
+        except Exception as e:
+            print(f"Error fetching latest internship id: {e}")
+            return None
+
+    def get_internships_since(self, last_id: int, limit: int = 200, columns: str = '*') -> List[Dict]:
+        try:
+            return self._fetch_all(f'SELECT {columns} FROM internships WHERE id > ? ORDER BY id LIMIT ?', (last_id, limit))
+        except Exception as e:
+            print(f"Error fetching new internships: {e}")
+            return []
+
+    def get_existing_content_hashes(self, content_hashes: List[str]) -> Set[str]:
+        existing = set()
+        try:
+            for start in range(0, len(content_hashes), 500):
+                chunk = content_hashes[start:start + 500]
+                placeholders = ', '.join('?' for _ in chunk)
+                rows = self._connection().execute(
+                    f'SELECT content_hash FROM internships WHERE content_hash IN ({placeholders})', chunk
+                ).fetchall()
+                existing.update(row[0] for row in rows)
+        except Exception as e:
+            print(f"Error checking existing internships: {e}")
+        return existing
+
+    def get_all_internships(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+        try:
+            return self._fetch_all(
+                'SELECT * FROM internships ORDER BY date_posted DESC LIMIT ? OFFSET ?',
+                (limit if limit is not None else -1, offset)
+            )
+        except Exception as e:
+            print(f"Error fetching internships: {e}")
+            return []
+
+    @staticmethod
+    def _search_filters(keyword: Optional[str], location: Optional[str], source_site: Optional[str]):
+        clauses, params = [], []
+        if keyword:
+            clauses.append('(job_title LIKE ? OR location LIKE ?)')
+            params += [f'%{keyword}%', f'%{keyword}%']
+        if location:
+            clauses.append('location LIKE ?')
+            params.append(f'%{location}%')
+        if source_site:
+            clauses.append('source_site = ?')
+            params.append(source_site)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def search_internships(self, keyword: Optional[str], location: Optional[str], source_site: Optional[str], limit: Optional[int]) -> List[Dict]:
+        try:
+            where, params = self._search_filters(keyword, location, source_site)
+            return self._fetch_all(f'SELECT * FROM internships {where} ORDER BY date_posted DESC LIMIT ?', params + [limit or -1])
+        except Exception as e:
+            print(f"Error searching internships: {e}")
+            return []
+
+    def get_search_facets(self, keyword: Optional[str], location: Optional[str], source_site: Optional[str], top_n: int = 20) -> Dict:
+        try:
+            conn = self._connection()
+            where, params = self._search_filters(keyword, location, source_site)
+            matches = f"SELECT source_site, COALESCE(location, 'Unknown') AS location, company_name, date_posted FROM internships {where}"
+
+            def top(column: str, limit: int = -1) -> Dict:
+                rows = conn.execute(
+                    f"WITH matches AS ({matches}) SELECT {column}, COUNT(*) AS count FROM matches GROUP BY {column} ORDER BY count DESC LIMIT ?",
+                    params + [limit]
+                ).fetchall()
+                return dict(rows) or None
+
+            age = conn.execute(
+                f"""WITH matches AS ({matches}) SELECT
+                    COUNT(*),
+                    SUM(date_posted >= strftime('%Y-%m-%dT%H:%M:%f', 'now', '-1 day')),
+                    SUM(date_posted >= strftime('%Y-%m-%dT%H:%M:%f', 'now', '-7 days')),
+                    SUM(date_posted >= strftime('%Y-%m-%dT%H:%M:%f', 'now', '-30 days')),
+                    SUM(date_posted IS NULL OR date_posted < strftime('%Y-%m-%dT%H:%M:%f', 'now', '-30 days'))
+                FROM matches""",
+                params
+            ).fetchone()
+            return {
+                'total': age[0],
+                'source_site': top('source_site'),
+                'location': top('location', top_n),
+                'company': top('company_name', top_n),
+                'posted_age': {
+                    'last_24h': age[1] or 0,
+                    'last_7d': age[2] or 0,
+                    'last_30d': age[3] or 0,
+                    'older': age[4] or 0,
+                },
+            }
+        except Exception as e:
+            print(f"Error fetching search facets: {e}")
+            return {"error": str(e)}
+
+    def get_aggregated_stats(self) -> Dict:
+        try:
+            conn = self._connection()
+            total = conn.execute('SELECT COUNT(*) FROM internships').fetchone()[0]
+            by_source = conn.execute(
+                'SELECT source_site, COUNT(*) FROM internships GROUP BY source_site'
+            ).fetchall()
+            locations = conn.execute(
+                "SELECT location, COUNT(*) AS count FROM internships WHERE location IS NOT NULL AND location != 'Remote' "
+                "GROUP BY location ORDER BY count DESC LIMIT 10"
+            ).fetchall()
+            companies = conn.execute(
+                'SELECT company_name, COUNT(*) AS count FROM internships GROUP BY company_name ORDER BY count DESC LIMIT 10'
+            ).fetchall()
+            return {
+                'total_internships': total,
+                'by_source': dict(by_source) or None,
+                'top_10_locations': dict(locations) or None,
+                'top_10_companies': dict(companies) or None,
+            }
+        except Exception as e:
+            print(f"Error fetching aggregated stats: {e}")
+            return {"error": str(e)}
+
+    def log_scrape_start(self, source_site: str) -> int:
+        try:
+            conn = self._connection()
+            cursor = conn.execute(
+                "INSERT INTO scrape_logs (source_site, status) VALUES (?, 'running')", (source_site,)
+            )
+            conn.commit()
+            return cursor.lastrowid
+        except Exception:
+            return 0
+
+    def log_scrape_end(self, log_id: int, internships_found: int, status: str, error_message: Optional[str] = None):
+        if not log_id: return
+        try:
+            conn = self._connection()
+            conn.execute(
+                'UPDATE scrape_logs SET status = ?, internships_found = ?, completed_at = ?, error_message = ? WHERE id = ?',
+                (status, internships_found, datetime.utcnow().isoformat(), error_message, log_id)
+            )
+            conn.commit()
+        except Exception:
+            pass
+
+    def get_latest_scrape_info(self) -> Optional[Dict]:
+        try:
+            rows = self._fetch_all('SELECT * FROM scrape_logs ORDER BY started_at DESC LIMIT 1')
+            return rows[0] if rows else None
+        except Exception:
+            return None
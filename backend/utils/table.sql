@@ -66,4 +66,149 @@ BEGIN
         )
     );
 END;
-$$;
\ No newline at end of file
+$$;
+
+-- 7. CREATE THE FACET COUNTS FUNCTION FOR SEARCH
+-- Counts matching listings by source, location, company and posting age in a
+-- single statement, using the same filters as the search endpoint.
+CREATE OR REPLACE FUNCTION get_internship_facets(
+    p_keyword TEXT DEFAULT NULL,
+    p_location TEXT DEFAULT NULL,
+    p_source_site TEXT DEFAULT NULL,
+    p_top_n INTEGER DEFAULT 20
+)
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+    WITH matches AS (
+        SELECT source_site, COALESCE(location, 'Unknown') AS location, company_name, date_posted
+        FROM public.internships
+        WHERE (p_keyword IS NULL OR job_title ILIKE '%' || p_keyword || '%' OR location ILIKE '%' || p_keyword || '%')
+          AND (p_location IS NULL OR location ILIKE '%' || p_location || '%')
+          AND (p_source_site IS NULL OR source_site = p_source_site)
+    )
+    SELECT json_build_object(
+        'total', (SELECT COUNT(*) FROM matches),
+        'source_site', (SELECT json_object_agg(source_site, count) FROM (SELECT source_site, COUNT(*) AS count FROM matches GROUP BY source_site ORDER BY count DESC) AS sources),
+        'location', (SELECT json_object_agg(location, count) FROM (SELECT location, COUNT(*) AS count FROM matches GROUP BY location ORDER BY count DESC LIMIT p_top_n) AS locations),
+        'company', (SELECT json_object_agg(company_name, count) FROM (SELECT company_name, COUNT(*) AS count FROM matches GROUP BY company_name ORDER BY count DESC LIMIT p_top_n) AS companies),
+        'posted_age', (
+            SELECT json_build_object(
+                'last_24h', COUNT(*) FILTER (WHERE date_posted >= NOW() - INTERVAL '1 day'),
+                'last_7d', COUNT(*) FILTER (WHERE date_posted >= NOW() - INTERVAL '7 days'),
+                'last_30d', COUNT(*) FILTER (WHERE date_posted >= NOW() - INTERVAL '30 days'),
+                'older', COUNT(*) FILTER (WHERE date_posted < NOW() - INTERVAL '30 days' OR date_posted IS NULL)
+            )
+            FROM matches
+        )
+    );
+$$;
+
+
+-- 8. RETENTION: TRACK WHEN LISTINGS WERE LAST SEEN AND ARCHIVE STALE ONES
+-- Every scrape refreshes last_seen_at for the listings it finds, so rows that
+-- stop appearing (or are simply too old) can be moved out of the hot table.
+ALTER TABLE public.internships ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMPTZ DEFAULT NOW() NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_internships_last_seen_at ON public.internships (last_seen_at);
+
+CREATE TABLE IF NOT EXISTS public.internships_archive (
+    id BIGINT PRIMARY KEY,
+    job_title TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    location TEXT,
+    employment_type TEXT,
+    job_description TEXT,
+    apply_link TEXT,
+    source_site TEXT NOT NULL,
+    date_posted TIMESTAMPTZ,
+    scraped_at TIMESTAMPTZ,
+    salary TEXT,
+    content_hash TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    last_seen_at TIMESTAMPTZ NOT NULL,
+    archived_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+-- One archive row per listing: a listing archived again after reappearing
+-- replaces its previous archive row instead of piling up duplicates.
+DELETE FROM public.internships_archive AS older
+USING public.internships_archive AS newer
+WHERE older.content_hash = newer.content_hash AND older.id < newer.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_internships_archive_content_hash ON public.internships_archive (content_hash);
+
+-- Runs that returned listings, per source. Empty or failed runs are logged
+-- with another status, so they never count as a cycle that "did not see" a row.
+CREATE INDEX IF NOT EXISTS idx_scrape_logs_source_started_at ON public.scrape_logs (source_site, started_at DESC);
+
+-- Moves at most p_batch_size expired rows to the archive and returns how many
+-- were moved. A row is unseen once the last p_unseen_cycles successful scrapes
+-- of its source all started after it was last seen; sources with fewer
+-- successful scrapes than that are left alone. Pass NULL to disable either
+-- policy. Call it repeatedly until it returns less than p_batch_size to drain
+-- a backlog in small transactions.
+DROP FUNCTION IF EXISTS archive_stale_internships(INTEGER, INTEGER, INTEGER);
+CREATE OR REPLACE FUNCTION archive_stale_internships(
+    p_max_age_days INTEGER DEFAULT NULL,
+    p_unseen_cycles INTEGER DEFAULT NULL,
+    p_batch_size INTEGER DEFAULT 1000
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    moved integer;
+BEGIN
+    WITH cutoffs AS (
+        SELECT source_site, started_at AS unseen_before
+        FROM (
+            SELECT source_site, started_at,
+                   ROW_NUMBER() OVER (PARTITION BY source_site ORDER BY started_at DESC) AS cycle
+            FROM public.scrape_logs
+            WHERE status = 'success'
+        ) AS runs
+        WHERE p_unseen_cycles IS NOT NULL AND cycle = p_unseen_cycles
+    ), expired AS (
+        SELECT i.id FROM public.internships AS i
+        LEFT JOIN cutoffs AS c ON c.source_site = i.source_site
+        WHERE (p_max_age_days IS NOT NULL AND i.date_posted < NOW() - make_interval(days => p_max_age_days))
+           OR (c.unseen_before IS NOT NULL AND i.last_seen_at < c.unseen_before)
+        ORDER BY i.id
+        LIMIT p_batch_size
+        FOR UPDATE OF i SKIP LOCKED
+    ), moved_rows AS (
+        DELETE FROM public.internships AS i
+        USING expired
+        WHERE i.id = expired.id
+        RETURNING i.*
+    )
+    INSERT INTO public.internships_archive (
+        id, job_title, company_name, location, employment_type, job_description, apply_link,
+        source_site, date_posted, scraped_at, salary, content_hash, created_at, last_seen_at
+    )
+    SELECT
+        id, job_title, company_name, location, employment_type, job_description, apply_link,
+        source_site, date_posted, scraped_at, salary, content_hash, created_at, last_seen_at
+    FROM moved_rows
+    ON CONFLICT (content_hash) DO UPDATE SET
+        id = EXCLUDED.id,
+        job_title = EXCLUDED.job_title,
+        company_name = EXCLUDED.company_name,
+        location = EXCLUDED.location,
+        employment_type = EXCLUDED.employment_type,
+        job_description = EXCLUDED.job_description,
+        apply_link = EXCLUDED.apply_link,
+        source_site = EXCLUDED.source_site,
+        date_posted = EXCLUDED.date_posted,
+        scraped_at = EXCLUDED.scraped_at,
+        salary = EXCLUDED.salary,
+        created_at = EXCLUDED.created_at,
+        last_seen_at = EXCLUDED.last_seen_at,
+        archived_at = NOW();
+
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    RETURN moved;
+END;
+$$;
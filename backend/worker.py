@@ -0,0 +1,30 @@
+"""
+Standalone scheduler process. Run it once per deployment and start the API
+workers with SCHEDULER_ENABLED=false, so that scaling the API does not
+multiply the scraping load:
+
+    python worker.py
+"""
+import signal
+import threading
+from scheduler import ScraperScheduler
+
+def main():
+    scheduler = ScraperScheduler()
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        print(f"📴 Signal {signum} reçu, arrêt du worker...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    print("🚀 Starting Internship Aggregator scraper worker...")
+    scheduler.start()
+    while not stop_event.wait(timeout=1):
+        pass
+    scheduler.stop()
+
+if __name__ == "__main__":
+    main()